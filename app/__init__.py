@@ -2,12 +2,13 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager
+from .db_routing import RoutingSession
 # Creates instances of the extensions above but does not yet attach them to any app.
 
 # This allows attaching these extensions to the Flask app dynamically later, which is essential for the factory pattern.
 
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 login_manager = LoginManager()
 
@@ -18,6 +19,15 @@ def create_app():
     app = Flask(__name__, template_folder='templates', static_folder='static')
     app.config.from_object('config.Config')
 
+    if app.config.get('PROXY_FIX_X_FOR'):
+        # Behind the Heroku router remote_addr is the router; trust its X-Forwarded-For hop
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
+
+    if app.config.get('FAST_JSON_PROVIDER'):
+        from .serializers import FastJSONProvider
+        app.json = FastJSONProvider(app)
+
     db.init_app(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
@@ -28,4 +38,10 @@ def create_app():
     app.register_blueprint(auth_bp)
     app.register_blueprint(main_bp)
 
+    from . import assets, compression, db_routing, rate_limit
+    db_routing.init_app(app)
+    assets.init_app(app)
+    compression.init_app(app)
+    rate_limit.init_app(app)
+
     return app
@@ -0,0 +1,136 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+
+import click
+from flask import Blueprint, current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip variants are always built
+    brotli = None
+
+
+assets_bp = Blueprint('assets', __name__, url_prefix='/assets')
+
+ASSET_EXTENSIONS = ('.css', '.js')
+MANIFEST_NAME = 'manifest.json'
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Preferred encodings first; suffix is the extension of the precompressed file
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def _dist_folder(app):
+    return os.path.join(app.static_folder, app.config.get('ASSETS_DIST_DIR', 'dist'))
+
+
+def _hashed_name(filename, data):
+    root, ext = os.path.splitext(filename)
+    # Cache-busting only, not security; keeps FIPS-enforcing hosts happy
+    digest = hashlib.md5(data, usedforsecurity=False).hexdigest()[:12]
+    return f"{root}.{digest}{ext}"
+
+
+def _write_atomic(path, data):
+    # Several workers may build at once, so never expose a half-written file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def build_assets(app):
+    """Write content-hashed, precompressed copies of the static css/js files"""
+    static_folder = app.static_folder
+    dist = os.path.abspath(_dist_folder(app))
+    manifest = {}
+
+    for root, dirs, files in os.walk(static_folder):
+        # Skip dist itself but not siblings that merely share the prefix (e.g. static/distribution)
+        if os.path.commonpath([os.path.abspath(root), dist]) == dist:
+            continue
+        for name in files:
+            if not name.endswith(ASSET_EXTENSIONS):
+                continue
+            source = os.path.join(root, name)
+            filename = os.path.relpath(source, static_folder).replace(os.sep, '/')
+            with open(source, 'rb') as f:
+                data = f.read()
+
+            hashed = _hashed_name(filename, data)
+            manifest[filename] = hashed
+            target = os.path.join(dist, hashed)
+            if os.path.exists(target):
+                continue  # same content already built
+
+            _write_atomic(target, data)
+            _write_atomic(target + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                _write_atomic(target + '.br', brotli.compress(data))
+
+    _write_atomic(os.path.join(dist, MANIFEST_NAME), json.dumps(manifest, indent=2).encode('utf-8'))
+    return manifest
+
+
+def load_manifest(app):
+    """Read the asset manifest, or return an empty one if it was never built"""
+    try:
+        with open(os.path.join(_dist_folder(app), MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def asset_url(filename):
+    """url_for replacement that points at the hashed copy of a static file"""
+    hashed = current_app.extensions['asset_manifest'].get(filename)
+    if hashed is None:
+        return url_for('static', filename=filename)
+    return url_for('assets.asset', filename=hashed)
+
+
+@assets_bp.route('/<path:filename>')
+def asset(filename):
+    """Serve a hashed asset, preferring a precompressed variant"""
+    dist = _dist_folder(current_app)
+    mimetype = mimetypes.guess_type(filename)[0]
+
+    for encoding, suffix in ENCODINGS:
+        if request.accept_encodings[encoding] and os.path.isfile(os.path.join(dist, filename + suffix)):
+            response = send_from_directory(dist, filename + suffix, mimetype=mimetype)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(dist, filename, mimetype=mimetype)
+
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+@click.command('build-assets')
+def build_assets_command():
+    """Build hashed and precompressed static assets"""
+    manifest = build_assets(current_app)
+    for filename, hashed in manifest.items():
+        click.echo(f"✅ {filename} -> {hashed}")
+
+
+def init_app(app):
+    """Register the asset blueprint, template helper and CLI command"""
+    manifest = {}
+    if app.config.get('ASSETS_AUTO_BUILD'):
+        try:
+            manifest = build_assets(app)
+        except OSError as e:
+            # e.g. read-only filesystem; fall back to a manifest built at deploy time
+            app.logger.warning(f"Could not build static assets: {e}")
+    app.extensions['asset_manifest'] = manifest or load_manifest(app)
+
+    app.register_blueprint(assets_bp)
+    app.add_template_global(asset_url)
+    app.cli.add_command(build_assets_command)
@@ -1,7 +1,9 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, request, redirect, url_for, flash
 from .models import User
 from . import db, login_manager
 from flask_login import login_user, login_required, logout_user
+from .page_cache import render_cached
+from .rate_limit import rate_limit
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth', template_folder='templates')
 
@@ -18,9 +20,15 @@ def register():
         u.set_password(password)
         db.session.add(u); db.session.commit()
         flash('Account created. Login now.','success'); return redirect(url_for('auth.login'))
-    return render_template('register.html')
+    return render_cached('register.html')
+
+def _login_rate_limited(retry_after):
+    # Skip the password hash check entirely while throttled
+    flash(f'Too many login attempts. Try again in {int(retry_after) + 1} seconds.','danger')
+    return render_cached('login.html'), 429, {'Retry-After': str(int(retry_after) + 1)}
 
 @auth_bp.route('/login', methods=['GET','POST'])
+@rate_limit(_login_rate_limited, methods=['POST'])
 def login():
     if request.method == 'POST':
         email = request.form['email'].lower().strip()
@@ -41,7 +49,7 @@ def login():
             
             return redirect(url_for('main.dashboard'))
         flash('Invalid credentials','danger')
-    return render_template('login.html')
+    return render_cached('login.html')
 
 
 @auth_bp.route('/logout')
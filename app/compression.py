@@ -0,0 +1,38 @@
+import gzip
+
+from flask import current_app, request
+
+
+def gzip_if_large(data, mimetype):
+    """Gzip a body if compression is on and it is a large enough text type, else None"""
+    config = current_app.config
+    if (not config.get('COMPRESS_RESPONSES')
+            or mimetype not in config['COMPRESS_MIMETYPES']
+            or len(data) < config['COMPRESS_MIN_SIZE']):
+        return None
+    return gzip.compress(data, compresslevel=config['COMPRESS_LEVEL'])
+
+
+def compress_response(response):
+    """Gzip large text responses (API JSON, rendered pages) on the fly"""
+    if (response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or not request.accept_encodings['gzip']):
+        return response
+
+    compressed = gzip_if_large(response.get_data(), response.mimetype)
+    if compressed is None:
+        return response
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def init_app(app):
+    """Enable response compression if configured"""
+    if app.config.get('COMPRESS_RESPONSES'):
+        app.after_request(compress_response)
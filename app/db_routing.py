@@ -0,0 +1,70 @@
+import time
+
+from flask import current_app, g, has_request_context, request, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+REPLICA_BIND = 'replica'
+PIN_SESSION_KEY = '_replica_pin_until'
+
+
+class RoutingSession(Session):
+    """Session that sends reads to the replica bind during read-only requests
+
+    Flushes always go to the primary, and so does everything outside a
+    request or when no replica is configured.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and _use_replica():
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _use_replica():
+    return has_request_context() and g.get('use_replica', False)
+
+
+def replica_reads(methods=('GET', 'HEAD')):
+    """Mark a view as safe to serve from the read replica for these methods
+
+    Apply it directly under the route decorator so the flag sits on the
+    registered view function.
+    """
+    def decorator(view):
+        view.replica_methods = frozenset(methods)
+        return view
+    return decorator
+
+
+def _route_request():
+    """Decide before the view (and load_user) runs whether reads may use the replica"""
+    view = current_app.view_functions.get(request.endpoint)
+    methods = getattr(view, 'replica_methods', ())
+    # Read-your-writes: stay on the primary for a while after this user wrote
+    pinned = session.get(PIN_SESSION_KEY, 0) > time.time()
+    g.use_replica = request.method in methods and not pinned
+
+
+def _pin_after_write(response):
+    if g.get('db_wrote'):
+        session[PIN_SESSION_KEY] = time.time() + current_app.config['REPLICA_PIN_SECONDS']
+    return response
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _record_write(db_session, flush_context):
+    if has_request_context():
+        g.db_wrote = True
+        # Later reads in this request must see the row just written
+        g.use_replica = False
+
+
+def init_app(app):
+    """Enable replica routing when a replica bind is configured"""
+    if REPLICA_BIND not in (app.config.get('SQLALCHEMY_BINDS') or {}):
+        return
+    app.before_request(_route_request)
+    app.after_request(_pin_after_write)
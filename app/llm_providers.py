@@ -0,0 +1,92 @@
+import json
+import random
+import re
+import threading
+import time
+import zlib
+
+
+class LLMProviderError(RuntimeError):
+    """Raised when a provider fails to produce a response"""
+
+
+class GeminiProvider:
+    """Google Gemini via the google-generativeai SDK"""
+
+    def __init__(self, api_key, model_name='gemini-1.5-flash'):
+        # Imported lazily so the app and the stub provider work without the SDK
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate(self, prompt):
+        return self.model.generate_content(prompt).text
+
+
+class StubProvider:
+    """Deterministic offline provider for CI and load testing
+
+    ``latency`` is seconds slept per call, ``error_rate`` the fraction of calls
+    that raise (drawn from a generator seeded with ``seed``), and ``output`` a
+    fixed reply. Without ``output`` the reply is picked from the prompt's
+    checksum, and batch prompts get a JSON array with one entry per user id.
+    """
+
+    MESSAGES = [
+        "🚀 {xp} XP and climbing! Level {level} is just the warm-up. 💪",
+        "📈 Level {level} unlocked with {xp} XP, keep the commits coming! ✨",
+        "⚡ {xp} XP of pure progress. Level {level} looks good on you! 🎯",
+        "🧠 Every bug fixed counts: {xp} XP, Level {level}, and rising! 🔥",
+    ]
+
+    def __init__(self, latency=0.0, error_rate=0.0, output=None, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.output = output
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def generate(self, prompt):
+        with self._lock:
+            self.calls += 1
+            fail = self._random.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise LLMProviderError("Stub provider simulated failure")
+        if self.output is not None:
+            return self.output
+
+        batch_users = re.findall(r'^- id=(\d+):(.*)$', prompt, re.MULTILINE)
+        if batch_users:
+            return json.dumps([
+                {'id': int(user_id), 'message': self._message(details)}
+                for user_id, details in batch_users
+            ])
+        return self._message(prompt)
+
+    def _message(self, prompt):
+        xp = re.search(r'(\d+) XP', prompt)
+        level = re.search(r'Level:? (\d+)', prompt)
+        template = self.MESSAGES[zlib.crc32(prompt.encode('utf-8')) % len(self.MESSAGES)]
+        return template.format(xp=xp.group(1) if xp else 0, level=level.group(1) if level else 1)
+
+
+def get_provider(config):
+    """Build the provider selected by LLM_PROVIDER, or None if unavailable"""
+    name = config.get('LLM_PROVIDER', 'gemini')
+    if name == 'stub':
+        return StubProvider(
+            latency=config.get('STUB_LLM_LATENCY', 0.0),
+            error_rate=config.get('STUB_LLM_ERROR_RATE', 0.0),
+            output=config.get('STUB_LLM_OUTPUT'),
+            seed=config.get('STUB_LLM_SEED', 0)
+        )
+    if name == 'gemini':
+        api_key = config.get('GEMINI_API_KEY')
+        if not api_key:
+            return None
+        return GeminiProvider(api_key, config.get('LLM_MODEL', 'gemini-1.5-flash'))
+    raise ValueError(f"Unknown LLM_PROVIDER: {name}")
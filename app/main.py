@@ -3,7 +3,11 @@ from flask_login import login_required, current_user
 from .models import Task
 from . import db
 from datetime import datetime
-from .motivation_service import get_motivation_service
+from .motivation_service import MotivationService, get_motivation_service
+from .serializers import get_task_rows, tasks_response, task_response
+from .page_cache import render_cached
+from .rate_limit import rate_limit
+from .db_routing import replica_reads
 
 
 
@@ -12,30 +16,24 @@ main_bp = Blueprint('main', __name__, template_folder='templates')
 @main_bp.route('/')
 # @main_bp.route('/')
 def home():
-    return render_template('homepage.html')
+    return render_cached('homepage.html')
 
 
 @main_bp.route('/dashboard')
+@replica_reads()
 @login_required
 def dashboard():
     return render_template('dashboard.html', user=current_user)
 
 # API endpoints for tasks
 @main_bp.route('/api/tasks', methods=['GET','POST'])
+@replica_reads(methods=['GET'])
 @login_required
 def tasks_api():
     if request.method == 'GET':
-        tasks = Task.query.filter_by(user_id=current_user.id).all()
-        out = []
-        for t in tasks:
-            out.append({
-                'id': t.id,
-                'title': t.title,
-                'description': t.description,
-                'due_date': t.due_date.isoformat(),
-                'status': t.status
-            })
-        return jsonify(out)
+        tasks = get_task_rows(current_user.id)
+        # ?format=columnar returns {ids: [], titles: [], ...} which is smaller for long lists
+        return tasks_response(tasks, columnar=request.args.get('format') == 'columnar')
 
     # POST - Create new task
     data = request.get_json()
@@ -50,13 +48,7 @@ def tasks_api():
     db.session.commit()
     
     # Return complete task object (FIXED)
-    return jsonify({
-        'id': t.id,
-        'title': t.title,
-        'description': t.description,
-        'due_date': t.due_date.isoformat(),
-        'status': t.status
-    })
+    return task_response(t)
 # Add these new routes to your main.py file
 
 @main_bp.route('/api/tasks/<int:task_id>', methods=['PUT', 'DELETE'])
@@ -84,17 +76,12 @@ def task_detail_api(task_id):
                 xp_award = 5  # XP per completed task
                 user.xp = (user.xp or 0) + xp_award
                 db.session.commit()
-            return jsonify({
-                'id': task.id,
-                'title': task.title,
-                'description': task.description,
-                'due_date': task.due_date.isoformat(),
-                'status': task.status
-            })
+            return task_response(task)
         return jsonify({'error': 'No status provided'}), 400
 
 # Add this new route to your main.py
 @main_bp.route('/api/gamification')
+@replica_reads()
 @login_required
 def gamification_api():
     """Return user's gamification data"""
@@ -114,15 +101,43 @@ def gamification_api():
 # Update the import
 from .motivation_service import get_motivation_service
 
+# Last message per user, reused when the motivation endpoint is throttled.
+# Capped; the oldest entries are dropped first.
+_last_motivation = {}
+LAST_MOTIVATION_MAX_USERS = 1000
+
+
+def _remember_motivation(user_id, message):
+    _last_motivation.pop(user_id, None)  # re-insert so dict order tracks recency
+    _last_motivation[user_id] = message
+    while len(_last_motivation) > LAST_MOTIVATION_MAX_USERS:
+        _last_motivation.pop(next(iter(_last_motivation)), None)
+
+
+def _motivation_rate_limited(retry_after):
+    """Cheap response for over-limit polling: no LLM call"""
+    message = _last_motivation.get(current_user.id)
+    if message is None:
+        message = MotivationService()._get_fallback_message(current_user)
+    return jsonify({
+        'message': message,
+        'generated_at': datetime.now().isoformat(),
+        'rate_limited': True,
+        'retry_after': round(retry_after, 1)
+    })
+
+
 # Update the route
 @main_bp.route('/api/motivation')
+@replica_reads()
 @login_required
+@rate_limit(_motivation_rate_limited)
 def motivation_api():
     """Generate personalized motivational message"""
     try:
-        api_key = current_app.config.get('GEMINI_API_KEY')
-        motivation_service = get_motivation_service(api_key)
+        motivation_service = get_motivation_service(current_app.config)
         message = motivation_service.generate_personalized_motivation(current_user)
+        _remember_motivation(current_user.id, message)
         
         return jsonify({
             'message': message,
@@ -1,23 +1,154 @@
-import google.generativeai as genai
+import json
 import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from .llm_providers import GeminiProvider, get_provider
+
+CODING_FOCUS_AREAS = [
+    "problem-solving", "debugging", "learning new frameworks", 
+    "building projects", "algorithm practice", "code optimization",
+    "skill development", "programming challenges", "web development",
+    "software engineering", "data structures", "clean code practices"
+]
+
+MESSAGE_STYLES = [
+    "casual and friendly",
+    "inspiring and motivational", 
+    "encouraging and supportive",
+    "energetic and enthusiastic",
+    "wise and mentoring",
+    "playful and fun",
+    "confident and empowering"
+]
+
+OPENING_STYLES = [
+    "Start with an action word or emoji",
+    "Begin with a statement about progress", 
+    "Open with a coding-related metaphor",
+    "Start with current time/situation reference",
+    "Begin with an achievement acknowledgment",
+    "Open with a future-focused statement",
+    "Start with an inspiring coding fact or tip",
+    "Begin with XP or level reference creatively",
+    "Open with streak motivation uniquely",
+    "Start with focus area encouragement"
+]
+
+STATE_GUIDANCE = {
+    'streak_master': "Celebrate their amazing streak creatively without generic greetings!",
+    'consistent': "Acknowledge their consistency in a unique way!",
+    'building_habit': "Encourage their growing coding habit uniquely!",
+    'experienced': "Challenge them to reach new coding heights!",
+    'beginner': "Welcome their coding journey with fresh energy!"
+}
+
+# Built once at import. Must not contain anything user- or call-specific,
+# otherwise provider prefix caching stops working.
+MOTIVATION_PROMPT_PREFIX = """
+You are a supportive coding mentor and motivational coach. Create a unique motivational message for each user described at the end.
+
+GENERAL REQUIREMENTS:
+- Keep it 1-2 sentences (maximum 140 characters)
+- Use relevant emojis (2-3 max)
+- NEVER start with "Hey coder!", "Hello coder!", "Hi coder!" or similar repetitive greetings
+- Make each message structure completely different
+- Be creative and avoid generic openings
+
+STRICTLY AVOID:
+- Generic greetings like "Hey", "Hello", "Hi there", "What's up"
+- Repetitive openings
+- Same sentence structure as previous messages
+- Generic programming terms without context
+- Starting with "Coder" or "Developer" or similar titles
+
+BE CREATIVE WITH OPENINGS LIKE:
+- Start with XP numbers, emojis, actions, or progress statements
+- Use metaphors, time references, or achievement celebrations
+- Focus on the coding journey, not just greeting the person
+"""
+
+MOTIVATION_PROMPT_USER_TEMPLATE = """
+User Context:
+- Interests: {interests}
+- Current Level: {level}
+- Experience Points: {xp}
+- Login Streak: {streak} days
+- Total Study Days: {total_days}
+- Time: {time_of_day}
+- Focus Area: {focus_area}
+
+MESSAGE REQUIREMENTS:
+1. {opening}
+2. Make it {style} in tone
+3. Reference their {xp} XP and Level {level} naturally
+4. Make it about {interests_lower} specifically
+5. Focus on {time_of_day} {focus_area} vibes
+
+{state_guidance}"""
+
+MOTIVATION_BATCH_PROMPT_TEMPLATE = """
+Users (all {interests} enthusiasts, currently '{state}', {time_of_day}):
+{users_block}
+
+MESSAGE REQUIREMENTS:
+1. Write one message per user above
+2. Reference that user's XP and level naturally
+3. Make it about {interests_lower} specifically
+4. Every message must have a different structure and opening
+
+{state_guidance}
+
+Respond with ONLY a JSON array, no other text:
+[{{"id": <user id>, "message": "<message>"}}, ...]
+"""
+
+
+def estimate_tokens(text):
+    """Rough token count (about 4 characters per token for English)"""
+    return (len(text) + 3) // 4
+
 
 class MotivationService:
-    def __init__(self, api_key=None):
-        """Initialize Gemini AI with API key"""
-        if api_key:
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
-        else:
-            self.model = None
+    def __init__(self, api_key=None, provider=None, variation_seconds=60):
+        """Initialize with an LLM provider (Gemini when only an API key is given)"""
+        if provider is None and api_key:
+            provider = GeminiProvider(api_key)
+        self.provider = provider
+        self.variation_seconds = variation_seconds
+        
+        # Responses for the current time bucket, keyed on the exact prompt
+        self._response_cache = {}
+        self._response_cache_bucket = None
+        self._stats_lock = threading.Lock()
+        self.prompts_sent = 0
+        self.prompt_tokens_sent = 0
+    
+    def get_prompt_stats(self):
+        """Prompt volume sent to the provider, for measuring prompt changes"""
+        with self._stats_lock:
+            prompts, tokens = self.prompts_sent, self.prompt_tokens_sent
+        return {
+            'prompts_sent': prompts,
+            'prompt_tokens_sent': tokens,
+            'avg_tokens_per_request': tokens / prompts if prompts else 0
+        }
+    
+    def _send_prompt(self, prompt):
+        """Send a prompt to the provider, recording its estimated token count"""
+        with self._stats_lock:
+            self.prompts_sent += 1
+            self.prompt_tokens_sent += estimate_tokens(prompt)
+        return self.provider.generate(prompt)
     
     def generate_personalized_motivation(self, user):
-        """Generate personalized motivational message using Gemini API"""
+        """Generate personalized motivational message using the LLM provider"""
         
-        print(f"DEBUG: Model initialized: {bool(self.model)}")
+        print(f"DEBUG: Model initialized: {bool(self.provider)}")
         
         # If no API key or model available, return fallback
-        if not self.model:
+        if not self.provider:
             print("DEBUG: Using fallback - no model available")
             return self._get_fallback_message(user)
         
@@ -26,32 +157,132 @@ class MotivationService:
             user_context = self._build_user_context(user)
             print(f"DEBUG: User context: {user_context}")
             
-            # Generate prompt for Gemini
+            # Generate prompt for the LLM
             prompt = self._create_motivation_prompt(user_context)
-            print(f"DEBUG: Generated prompt")
+            print(f"DEBUG: Generated prompt (~{estimate_tokens(prompt)} tokens)")
+            
+            # Same user, same time bucket -> same prompt, so reuse the answer
+            bucket = self._get_time_bucket()
+            if bucket != self._response_cache_bucket:
+                self._response_cache = {}
+                self._response_cache_bucket = bucket
+            cached = self._response_cache.get(prompt)
+            if cached is not None:
+                print("DEBUG: Using cached AI response")
+                return cached
             
-            # Get response from Gemini
-            print("DEBUG: Calling Gemini API...")
-            response = self.model.generate_content(prompt)
-            print(f"DEBUG: AI Response: {response.text}")
+            # Get response from the provider
+            print("DEBUG: Calling LLM provider...")
+            text = self._send_prompt(prompt)
+            print(f"DEBUG: AI Response: {text}")
             
             # Return the generated message
-            return response.text.strip()
+            message = text.strip()
+            self._response_cache[prompt] = message
+            return message
             
         except Exception as e:
             print(f"DEBUG: Error generating AI motivation: {e}")
             return self._get_fallback_message(user)
     
+    def generate_batch_motivations(self, users, batch_size=10, max_workers=4):
+        """Generate messages for many users (e.g. a daily digest) in few LLM calls
+
+        Users with the same motivation state and interests are packed into one
+        prompt, so N users cost roughly N / batch_size calls. Batches run on a
+        thread pool with at most ``max_workers`` requests in flight.
+        Returns a dict of user id -> message.
+        """
+        users = list(users)
+        if not self.provider:
+            return {user.id: self._get_fallback_message(user) for user in users}
+
+        # Build contexts here: ORM objects must not be touched from worker threads
+        contexts = {user.id: self._build_user_context(user) for user in users}
+        batches = self._group_into_batches(contexts, batch_size)
+
+        messages = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for result in executor.map(self._generate_batch, batches):
+                messages.update(result)
+
+        # Anyone the model skipped (or whose batch failed) gets a fallback
+        for user in users:
+            if not messages.get(user.id):
+                messages[user.id] = self._get_fallback_message(user)
+        return messages
+
+    def _group_into_batches(self, contexts, batch_size):
+        """Group user contexts by state and interests, then split into batches"""
+        groups = {}
+        for user_id, context in contexts.items():
+            key = (context['state'], context['interests'].strip().lower())
+            groups.setdefault(key, []).append((user_id, context))
+
+        batches = []
+        for members in groups.values():
+            for i in range(0, len(members), batch_size):
+                batches.append(members[i:i + batch_size])
+        return batches
+
+    def _generate_batch(self, batch):
+        """Run one batched prompt and return the messages it produced"""
+        try:
+            prompt = self._create_batch_motivation_prompt(batch)
+            text = self._send_prompt(prompt)
+            return self._parse_batch_response(text, {user_id for user_id, _ in batch})
+        except Exception as e:
+            print(f"DEBUG: Error generating batch motivation: {e}")
+            return {}
+
+    def _create_batch_motivation_prompt(self, batch):
+        """Create one prompt covering every user in a batch"""
+        shared = batch[0][1]
+        lines = []
+        for user_id, context in batch:
+            lines.append(
+                f"- id={user_id}: Level {context['level']}, {context['xp']} XP, "
+                f"{context['streak']} day streak, {context['total_days']} study days, "
+                f"focus: {context['focus_area']}"
+            )
+        users_block = "\n".join(lines)
+
+        # Same static prefix as single prompts, so batches share the provider's prefix cache
+        return MOTIVATION_PROMPT_PREFIX + MOTIVATION_BATCH_PROMPT_TEMPLATE.format(
+            interests=shared['interests'],
+            interests_lower=shared['interests'].lower(),
+            state=shared['state'],
+            time_of_day=shared['time_of_day'],
+            users_block=users_block,
+            state_guidance=STATE_GUIDANCE[shared['state']]
+        )
+
+    def _parse_batch_response(self, text, user_ids):
+        """Pull {id: message} out of the model's JSON answer"""
+        text = text.strip()
+        if text.startswith("```"):
+            # Drop a markdown code fence such as ```json ... ```
+            text = text.split("\n", 1)[1] if "\n" in text else ""
+            text = text.rsplit("```", 1)[0]
+
+        messages = {}
+        for item in json.loads(text):
+            try:
+                user_id = int(item['id'])
+                message = str(item['message']).strip()
+            except (KeyError, TypeError, ValueError):
+                continue
+            if user_id in user_ids and message:
+                messages[user_id] = message
+        return messages
+
     def _build_user_context(self, user):
         """Build context about user for AI"""
         
-        # Add some randomness to context
-        coding_focus_areas = [
-            "problem-solving", "debugging", "learning new frameworks", 
-            "building projects", "algorithm practice", "code optimization",
-            "skill development", "programming challenges", "web development",
-            "software engineering", "data structures", "clean code practices"
-        ]
+        # Seeded per user and time bucket: varied over time, but the same
+        # inputs always give the same prompt (so it can be cached)
+        variation_seed = f"{user.id}:{self._get_time_bucket()}"
+        rng = random.Random(variation_seed)
         
         context = {
             'interests': user.interests or "general studies",
@@ -60,8 +291,8 @@ class MotivationService:
             'streak': user.streak,
             'total_days': user.total_days_logged or 0,
             'time_of_day': self._get_time_of_day(),
-            'focus_area': random.choice(coding_focus_areas),  # Add variety
-            'session_number': random.randint(1, 100)  # Add uniqueness
+            'focus_area': rng.choice(CODING_FOCUS_AREAS),  # Add variety
+            'variation_seed': variation_seed
         }
         
         # Determine user's motivation state
@@ -79,87 +310,30 @@ class MotivationService:
         return context
     
     def _create_motivation_prompt(self, context):
-        """Create AI prompt based on user context"""
-        
-        # Add random elements for variety
-        message_styles = [
-            "casual and friendly",
-            "inspiring and motivational", 
-            "encouraging and supportive",
-            "energetic and enthusiastic",
-            "wise and mentoring",
-            "playful and fun",
-            "confident and empowering"
-        ]
+        """Create AI prompt based on user context
         
-        opening_styles = [
-            "Start with an action word or emoji",
-            "Begin with a statement about progress", 
-            "Open with a coding-related metaphor",
-            "Start with current time/situation reference",
-            "Begin with an achievement acknowledgment",
-            "Open with a future-focused statement",
-            "Start with an inspiring coding fact or tip",
-            "Begin with XP or level reference creatively",
-            "Open with streak motivation uniquely",
-            "Start with focus area encouragement"
-        ]
+        The static prefix is identical for every user; only the short
+        user section varies, so provider-side prefix caching applies.
+        """
+        rng = random.Random(f"{context['variation_seed']}:prompt")
         
-        random_style = random.choice(message_styles)
-        random_opening = random.choice(opening_styles)
-        random_number = random.randint(1, 1000)  # Add uniqueness
-        
-        base_prompt = f"""
-You are a supportive coding mentor and motivational coach. Create a unique motivational message for a {context['interests'].lower()} enthusiast (Request #{random_number}).
-
-User Context:
-- Interests: {context['interests']}
-- Current Level: {context['level']}
-- Experience Points: {context['xp']}
-- Login Streak: {context['streak']} days
-- Total Study Days: {context['total_days']}
-- Time: {context['time_of_day']}
-- Focus Area: {context['focus_area']}
-
-IMPORTANT REQUIREMENTS:
-1. {random_opening}
-2. Make it {random_style} in tone
-3. Reference their {context['xp']} XP and Level {context['level']} naturally
-4. Keep it 1-2 sentences (maximum 140 characters)
-5. Use relevant emojis (2-3 max)
-6. Make it about {context['interests'].lower()} specifically
-7. NEVER start with "Hey coder!", "Hello coder!", "Hi coder!" or similar repetitive greetings
-8. Make each message structure completely different
-9. Focus on {context['time_of_day']} {context['focus_area']} vibes
-10. Be creative and avoid generic openings
-
-STRICTLY AVOID:
-- Generic greetings like "Hey", "Hello", "Hi there", "What's up"
-- Repetitive openings
-- Same sentence structure as previous messages
-- Generic programming terms without context
-- Starting with "Coder" or "Developer" or similar titles
-
-BE CREATIVE WITH OPENINGS LIKE:
-- Start with XP numbers, emojis, actions, or progress statements
-- Use metaphors, time references, or achievement celebrations
-- Focus on the coding journey, not just greeting the person
-
-"""
-        
-        # Add state-specific guidance
-        if context['state'] == 'streak_master':
-            base_prompt += "Celebrate their amazing streak creatively without generic greetings!"
-        elif context['state'] == 'consistent':
-            base_prompt += "Acknowledge their consistency in a unique way!"
-        elif context['state'] == 'building_habit':
-            base_prompt += "Encourage their growing coding habit uniquely!"
-        elif context['state'] == 'experienced':
-            base_prompt += "Challenge them to reach new coding heights!"
-        else:
-            base_prompt += "Welcome their coding journey with fresh energy!"
-            
-        return base_prompt
+        return MOTIVATION_PROMPT_PREFIX + MOTIVATION_PROMPT_USER_TEMPLATE.format(
+            interests=context['interests'],
+            interests_lower=context['interests'].lower(),
+            level=context['level'],
+            xp=context['xp'],
+            streak=context['streak'],
+            total_days=context['total_days'],
+            time_of_day=context['time_of_day'],
+            focus_area=context['focus_area'],
+            opening=rng.choice(OPENING_STYLES),
+            style=rng.choice(MESSAGE_STYLES),
+            state_guidance=STATE_GUIDANCE[context['state']]
+        )
+    
+    def _get_time_bucket(self):
+        """Index of the current variation window"""
+        return int(time.time() // self.variation_seconds)
     
     def _get_time_of_day(self):
         """Get current time period"""
@@ -211,7 +385,22 @@ BE CREATIVE WITH OPENINGS LIKE:
             
         return random.choice(messages[category])
 
+# Providers are reused across requests; rebuilt only when their settings change
+SERVICE_SETTINGS = (
+    'LLM_PROVIDER', 'LLM_MODEL', 'GEMINI_API_KEY',
+    'STUB_LLM_LATENCY', 'STUB_LLM_ERROR_RATE', 'STUB_LLM_OUTPUT', 'STUB_LLM_SEED',
+    'MOTIVATION_VARIATION_SECONDS'
+)
+_services = {}
+
 # Initialize service
-def get_motivation_service(api_key):
-    """Get motivation service instance"""
-    return MotivationService(api_key)
+def get_motivation_service(config):
+    """Get motivation service instance for the provider selected in config"""
+    key = tuple(config.get(name) for name in SERVICE_SETTINGS)
+    service = _services.get(key)
+    if service is None:
+        service = _services[key] = MotivationService(
+            provider=get_provider(config),
+            variation_seconds=config.get('MOTIVATION_VARIATION_SECONDS', 60)
+        )
+    return service
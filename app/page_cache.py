@@ -0,0 +1,55 @@
+import os
+import threading
+
+from flask import current_app, make_response, render_template, request, session
+
+from .compression import gzip_if_large
+
+# Rendered (html, gzipped html or None) keyed on (template, locale, script root, deploy version)
+_page_cache = {}
+_page_cache_lock = threading.Lock()
+
+
+def _deploy_version(app):
+    """Identify the running release so a deploy never serves stale pages"""
+    return app.config.get('DEPLOY_VERSION') or str(os.getpid())
+
+
+def render_cached(template_name):
+    """Render a context-free template, reusing the HTML for anonymous hits
+
+    Pages with pending flash messages are always rendered fresh and never
+    stored, since the messages are part of the output.
+    """
+    app = current_app._get_current_object()
+    if not app.config.get('PAGE_CACHE_ENABLED') or session.get('_flashes'):
+        return render_template(template_name)
+
+    locale = request.accept_languages.best_match(app.config['PAGE_CACHE_LOCALES']) \
+        or app.config['PAGE_CACHE_LOCALES'][0]
+    key = (template_name, locale, request.script_root, _deploy_version(app))
+
+    entry = _page_cache.get(key)
+    if entry is None:
+        html = render_template(template_name)
+        # Compress once here so cache hits skip the per-request gzip
+        entry = (html, gzip_if_large(html.encode('utf-8'), 'text/html'))
+        with _page_cache_lock:
+            _page_cache[key] = entry
+
+    html, compressed = entry
+    if compressed is None:
+        return html
+    if request.accept_encodings['gzip']:
+        response = make_response(compressed)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = make_response(html)
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def clear_page_cache():
+    """Drop every cached page (e.g. after editing templates in a shell)"""
+    with _page_cache_lock:
+        _page_cache.clear()
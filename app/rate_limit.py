@@ -0,0 +1,140 @@
+import os
+import sqlite3
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, request
+from flask_login import current_user
+
+# How often full buckets are swept; a full bucket acts exactly like a missing one
+SWEEP_INTERVAL = 60
+
+
+class MemoryBackend:
+    """Token buckets kept in this process only"""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def consume(self, key, capacity, refill_per_second, now=None):
+        """Take one token from the bucket; return (allowed, seconds_until_next_token)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated, _ = self._buckets.get(key, (capacity, now, now))
+            tokens, allowed, retry_after = _take_token(tokens, updated, now, capacity, refill_per_second)
+            self._buckets[key] = (tokens, now, _full_at(tokens, now, capacity, refill_per_second))
+            if now >= self._next_sweep:
+                self._sweep(now)
+        return allowed, retry_after
+
+    def _sweep(self, now):
+        for key in [key for key, (_, _, full_at) in self._buckets.items() if full_at <= now]:
+            del self._buckets[key]
+        self._next_sweep = now + SWEEP_INTERVAL
+
+
+class SQLiteBackend:
+    """Token buckets in a local SQLite file, shared by all workers on the host"""
+
+    def __init__(self, path):
+        self.path = path
+        self._next_sweep = 0.0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS rate_limit_buckets '
+                '(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, full_at REAL NOT NULL)'
+            )
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5, isolation_level=None)
+
+    def consume(self, key, capacity, refill_per_second, now=None):
+        """Take one token from the bucket; return (allowed, seconds_until_next_token)"""
+        # Wall clock, since monotonic time is not comparable across processes
+        now = time.time() if now is None else now
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                'SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?', (key,)
+            ).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens, allowed, retry_after = _take_token(tokens, updated, now, capacity, refill_per_second)
+            conn.execute(
+                'INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated, full_at) VALUES (?, ?, ?, ?)',
+                (key, tokens, now, _full_at(tokens, now, capacity, refill_per_second))
+            )
+            if now >= self._next_sweep:
+                conn.execute('DELETE FROM rate_limit_buckets WHERE full_at <= ?', (now,))
+                self._next_sweep = now + SWEEP_INTERVAL
+            conn.execute('COMMIT')
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        return allowed, retry_after
+
+
+def _take_token(tokens, updated, now, capacity, refill_per_second):
+    """Refill a bucket for the elapsed time and try to take one token"""
+    tokens = min(capacity, tokens + max(0.0, now - updated) * refill_per_second)
+    if tokens >= 1:
+        return tokens - 1, True, 0.0
+    return tokens, False, (1 - tokens) / refill_per_second
+
+
+def _full_at(tokens, now, capacity, refill_per_second):
+    """Time at which a bucket will have refilled to capacity"""
+    return now + (capacity - tokens) / refill_per_second
+
+
+def _limit_key():
+    """Bucket per user when logged in, otherwise per client address"""
+    if current_user.is_authenticated:
+        identity = f"user:{current_user.id}"
+    else:
+        identity = f"ip:{request.remote_addr}"
+    return f"{request.endpoint}:{identity}"
+
+
+def rate_limit(fallback, methods=None):
+    """Throttle a view using the limit configured for its endpoint in RATE_LIMITS
+
+    When the bucket is empty ``fallback(retry_after)`` is returned instead of
+    running the view, so over-limit requests stay cheap.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            limit = current_app.config['RATE_LIMITS'].get(request.endpoint)
+            limiter = current_app.extensions.get('rate_limiter')
+            if limit is None or limiter is None or (methods and request.method not in methods):
+                return view(*args, **kwargs)
+
+            requests_allowed, period = limit
+            allowed, retry_after = limiter.consume(_limit_key(), requests_allowed, requests_allowed / period)
+            if allowed:
+                return view(*args, **kwargs)
+            return fallback(retry_after)
+        return wrapped
+    return decorator
+
+
+def init_app(app):
+    """Create the configured rate limit backend"""
+    if not app.config.get('RATE_LIMIT_ENABLED'):
+        return
+    if app.config.get('RATE_LIMIT_BACKEND') == 'sqlite':
+        backend = SQLiteBackend(app.config['RATE_LIMIT_SQLITE_PATH'])
+    else:
+        backend = MemoryBackend()
+    app.extensions['rate_limiter'] = backend
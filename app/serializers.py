@@ -0,0 +1,83 @@
+from flask import jsonify
+from flask.json.provider import DefaultJSONProvider
+from .models import Task
+from . import db
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib encoder
+    orjson = None
+
+
+# Only the columns the dashboard actually needs. Selecting these directly gives
+# plain row tuples instead of full ORM entities (no identity map, no backrefs).
+TASK_FIELDS = ('id', 'title', 'description', 'due_date', 'status')
+TASK_COLUMNS = tuple(getattr(Task, name) for name in TASK_FIELDS)
+
+# Plural keys used by the columnar format, e.g. {"ids": [...], "titles": [...]}
+COLUMNAR_KEYS = ('ids', 'titles', 'descriptions', 'due_dates', 'statuses')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider that uses orjson when it is installed"""
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_PASSTHROUGH_DATETIME  # keep Flask's date formatting
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+        except TypeError:
+            # orjson is stricter (e.g. non-str dict keys); let the stdlib handle it
+            return super().dumps(obj)
+
+    def response(self, *args, **kwargs):
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        if orjson is None or pretty:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps(obj), mimetype=self.mimetype)
+
+
+def get_task_rows(user_id):
+    """Fetch a user's tasks as lightweight row tuples"""
+    query = db.select(*TASK_COLUMNS).where(Task.user_id == user_id).order_by(Task.id)
+    return db.session.execute(query).all()
+
+
+def serialize_task(task):
+    """Convert a task row (or Task object) into a dict"""
+    return {
+        'id': task.id,
+        'title': task.title,
+        'description': task.description,
+        'due_date': task.due_date.isoformat(),
+        'status': task.status
+    }
+
+
+def serialize_tasks_columnar(tasks):
+    """Convert task rows into one list per field"""
+    out = {key: [] for key in COLUMNAR_KEYS}
+    ids, titles, descriptions, due_dates, statuses = (out[key] for key in COLUMNAR_KEYS)
+    for t in tasks:
+        ids.append(t.id)
+        titles.append(t.title)
+        descriptions.append(t.description)
+        due_dates.append(t.due_date.isoformat())
+        statuses.append(t.status)
+    return out
+
+
+def tasks_response(tasks, columnar=False):
+    """Build the JSON response for a list of tasks"""
+    if columnar:
+        return jsonify(serialize_tasks_columnar(tasks))
+    return jsonify([serialize_task(t) for t in tasks])
+
+
+def task_response(task):
+    """Build the JSON response for a single task"""
+    return jsonify(serialize_task(task))
@@ -0,0 +1,84 @@
+import os
+import resource
+
+from . import db
+
+
+def preload_imports(app):
+    """Import heavy optional SDKs up front so forked workers share them"""
+    if app.config.get('LLM_PROVIDER') == 'gemini':
+        try:
+            import google.generativeai  # noqa: F401
+        except ImportError:
+            pass
+
+
+def warm_templates(app):
+    """Compile every Jinja template into the environment's cache"""
+    for name in app.jinja_env.list_templates():
+        if name.endswith('.html'):
+            app.jinja_env.get_template(name)
+
+
+def dispose_engines(app):
+    """Drop pooled connections inherited from the parent after fork
+
+    close=False leaves the parent's sockets alone; the worker just stops
+    using them and opens its own.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def warm_engines(app):
+    """Open one connection per engine so the first request skips the connect"""
+    with app.app_context():
+        for engine in db.engines.values():
+            with engine.connect():
+                pass
+
+
+def get_rss_mb():
+    """Resident memory of this process in MB (includes pages shared with the master)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Peak RSS; kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if os.uname().sysname == 'Darwin' else peak / 1024
+
+
+def get_shared_memory_mb():
+    """PSS and private memory in MB from /proc/self/smaps_rollup, or None if unavailable
+
+    Unlike RSS these separate out copy-on-write pages shared with the master,
+    so they show what preloading actually saves per worker.
+    """
+    fields = {}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                name, _, value = line.partition(':')
+                if name in ('Pss', 'Private_Clean', 'Private_Dirty'):
+                    fields[name] = int(value.split()[0])
+    except (OSError, ValueError):
+        return None
+    if 'Pss' not in fields:
+        return None
+    private = fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    return fields['Pss'] / 1024, private / 1024
+
+
+def describe_memory():
+    """One-line memory summary for startup logs"""
+    summary = f"RSS {get_rss_mb():.1f} MB"
+    shared = get_shared_memory_mb()
+    if shared is not None:
+        pss, private = shared
+        summary += f", PSS {pss:.1f} MB, private {private:.1f} MB"
+    return summary
@@ -25,8 +25,59 @@ class Config:
     SQLALCHEMY_DATABASE_URI = DATABASE_URL or os.environ.get("DATABASE_URL", "sqlite:///study_planner.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Optional read replica: read-only endpoints use it unless the user wrote recently
+    REPLICA_DATABASE_URL = os.environ.get("REPLICA_DATABASE_URL")
+    if REPLICA_DATABASE_URL and REPLICA_DATABASE_URL.startswith("postgres://"):
+        REPLICA_DATABASE_URL = REPLICA_DATABASE_URL.replace("postgres://", "postgresql://", 1)
+    SQLALCHEMY_BINDS = {'replica': REPLICA_DATABASE_URL} if REPLICA_DATABASE_URL else {}
+    REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", 10))
+    
     # Gemini API Configuration
     GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
     
+    # LLM provider for motivation messages: "gemini" or "stub" (offline, deterministic)
+    LLM_PROVIDER = os.environ.get("LLM_PROVIDER", "gemini")
+    LLM_MODEL = os.environ.get("LLM_MODEL", "gemini-1.5-flash")
+    STUB_LLM_LATENCY = float(os.environ.get("STUB_LLM_LATENCY", 0.0))  # seconds per call
+    STUB_LLM_ERROR_RATE = float(os.environ.get("STUB_LLM_ERROR_RATE", 0.0))  # 0.0 - 1.0
+    STUB_LLM_OUTPUT = os.environ.get("STUB_LLM_OUTPUT")  # fixed reply, optional
+    STUB_LLM_SEED = int(os.environ.get("STUB_LLM_SEED", 0))
+    # Prompt variation is seeded per user and per window of this many seconds
+    MOTIVATION_VARIATION_SECONDS = int(os.environ.get("MOTIVATION_VARIATION_SECONDS", 60))
+    
+    # Use orjson for API responses when it is installed
+    FAST_JSON_PROVIDER = os.environ.get("FAST_JSON_PROVIDER", "True").lower() == "true"
+    
+    # Static assets: hashed + precompressed copies written to static/dist
+    ASSETS_AUTO_BUILD = os.environ.get("ASSETS_AUTO_BUILD", "True").lower() == "true"
+    ASSETS_DIST_DIR = "dist"
+    
+    # Gzip large API/page responses on the fly
+    COMPRESS_RESPONSES = os.environ.get("COMPRESS_RESPONSES", "True").lower() == "true"
+    COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 1024))
+    COMPRESS_LEVEL = 6
+    COMPRESS_MIMETYPES = ['application/json', 'text/html']
+    
+    # Cache rendered homepage/login/register HTML in memory (off by default in DEBUG so template edits show up)
+    _debug_default = os.environ.get("DEBUG", "False").lower() == "true"
+    PAGE_CACHE_ENABLED = os.environ.get("PAGE_CACHE_ENABLED", str(not _debug_default)).lower() == "true"
+    PAGE_CACHE_LOCALES = ['en']
+    # Part of the page cache key. HEROKU_SLUG_COMMIT is set at runtime when the
+    # dyno metadata feature is enabled; otherwise the key falls back to the worker pid
+    DEPLOY_VERSION = os.environ.get("DEPLOY_VERSION") or os.environ.get("HEROKU_SLUG_COMMIT")
+    
+    # Number of reverse proxies in front of the app whose X-Forwarded-For is trusted.
+    # 0 (default) ignores the header, which clients can forge; the Procfile sets 1 for Heroku's router
+    PROXY_FIX_X_FOR = int(os.environ.get("PROXY_FIX_X_FOR", 0))
+    
+    # Token bucket rate limits per endpoint: (requests, per seconds)
+    RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "True").lower() == "true"
+    RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory")  # memory or sqlite
+    RATE_LIMIT_SQLITE_PATH = os.environ.get("RATE_LIMIT_SQLITE_PATH", "instance/rate_limits.db")
+    RATE_LIMITS = {
+        'main.motivation_api': (3, 60),
+        'auth.login': (5, 60),
+    }
+    
     # Production settings
     DEBUG = os.environ.get("DEBUG", "False").lower() == "true"
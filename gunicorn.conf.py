@@ -0,0 +1,49 @@
+# Gunicorn settings, loaded automatically from the working directory
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Load the app once in the master; workers inherit imports and compiled templates
+preload_app = True
+
+# Workers scale with cores (2 * cores + 1), capped to keep small dynos within memory
+_max_workers = int(os.environ.get('GUNICORN_MAX_WORKERS', 8))
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, _max_workers)))
+
+# Threads help with the I/O-bound LLM calls in /api/motivation
+threads = int(os.environ.get('GUNICORN_THREADS', 2))
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+keepalive = 5
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = 50
+
+
+def when_ready(server):
+    import wsgi
+    from app.warmup import describe_memory
+    server.log.info(
+        f"App preloaded in {wsgi.startup_seconds:.2f}s, master {describe_memory()}, "
+        f"{workers} workers x {threads} threads ({worker_class})"
+    )
+
+
+def post_fork(server, worker):
+    import wsgi
+    from app.warmup import dispose_engines
+    # Never share pooled DB connections across processes
+    dispose_engines(wsgi.app)
+
+
+def post_worker_init(worker):
+    import wsgi
+    from sqlalchemy.exc import SQLAlchemyError
+    from app.warmup import describe_memory, warm_engines
+    try:
+        warm_engines(wsgi.app)
+    except SQLAlchemyError as e:
+        # Still boot: pages that don't touch the DB keep working
+        worker.log.warning(f"Worker {worker.pid} could not warm DB connections: {e}")
+    worker.log.info(f"Worker {worker.pid} ready, {describe_memory()}")
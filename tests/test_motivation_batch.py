@@ -0,0 +1,55 @@
+import math
+import time
+from types import SimpleNamespace
+
+from app.llm_providers import StubProvider
+from app.motivation_service import MOTIVATION_PROMPT_PREFIX, MotivationService
+
+LATENCY = 0.02
+BATCH_SIZE = 10
+
+
+class FakeUser(SimpleNamespace):
+    def get_level(self):
+        return self.xp // 100 + 1
+
+
+def make_users():
+    # 4 groups of 50: two interests x two motivation states (beginner / streak_master)
+    users = []
+    for i in range(200):
+        users.append(FakeUser(
+            id=i + 1,
+            interests=['Python', 'Web Development'][i % 2],
+            xp=i % 100,
+            streak=[0, 20][(i // 2) % 2],
+            total_days_logged=i
+        ))
+    return users
+
+
+def test_batch_motivations_throughput():
+    users = make_users()
+    provider = StubProvider(latency=LATENCY)
+    service = MotivationService(provider=provider)
+
+    start = time.perf_counter()
+    messages = service.generate_batch_motivations(users, batch_size=BATCH_SIZE, max_workers=4)
+    elapsed = time.perf_counter() - start
+
+    # One call per batch: ceil(50 / 10) for each of the 4 groups
+    assert provider.calls == 4 * math.ceil(50 / BATCH_SIZE)
+
+    assert set(messages) == {user.id for user in users}
+    assert all(message.strip() for message in messages.values())
+
+    # One user at a time would take len(users) * LATENCY (4s here)
+    assert elapsed < len(users) * LATENCY / 10
+
+
+def test_batch_prompt_shares_static_prefix():
+    service = MotivationService(provider=StubProvider())
+    contexts = {user.id: service._build_user_context(user) for user in make_users()[:3]}
+    batch = service._group_into_batches(contexts, BATCH_SIZE)[0]
+
+    assert service._create_batch_motivation_prompt(batch).startswith(MOTIVATION_PROMPT_PREFIX)
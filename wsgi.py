@@ -0,0 +1,15 @@
+# Production entry point: gunicorn wsgi:app (settings in gunicorn.conf.py)
+import time
+
+_start = time.perf_counter()
+
+from app import create_app
+from app.warmup import preload_imports, warm_templates
+
+app = create_app()
+
+# Done once in the master when preload_app is on, so workers share it copy-on-write
+preload_imports(app)
+warm_templates(app)
+
+startup_seconds = time.perf_counter() - _start